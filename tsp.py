@@ -1,7 +1,104 @@
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+import heapq
+import itertools
 import math
 
-def greedy_tsp(graph: Dict[Any, Dict[Any, int]], start: Any, allow_disconnected: bool = True) -> Tuple[List[Any], int]:
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # Numba is optional; fall back to plain Python
+    prange = range
+
+    def get_num_threads():
+        return 1
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+INF = math.inf
+
+# Spellings of infinity accepted when entering costs
+_INF_TOKENS = frozenset({'inf', 'infinity', '∞'})
+_INF_STR = "∞ (Infinite)"
+
+# The Held-Karp DP table has 2^n * n entries (~250 MB at n = 20)
+HELD_KARP_MAX_NODES = 20
+
+# Visited sets are int bitmasks, which the jitted helpers hold in an int64
+MAX_BITMASK_NODES = 63
+
+
+def _to_matrix(graph: Dict[Any, Dict[Any, int]]) -> Tuple[List[Any], Dict[Any, int], np.ndarray]:
+    """Convert a dict-of-dict graph into a dense float64 distance matrix.
+
+    Missing edges and costs >= 999999 become INF.
+
+    Returns:
+        Tuple of (nodes, node_to_idx, dist)
+    """
+    nodes = list(graph.keys())
+    n = len(nodes)
+    idx = {node: i for i, node in enumerate(nodes)}
+
+    dist = np.full((n, n), INF, dtype=np.float64)
+    # One pass over the edges that exist; anything not listed stays INF
+    for i, from_node in enumerate(nodes):
+        for to_node, cost in graph[from_node].items():
+            j = idx.get(to_node)
+            if j is not None:
+                dist[i, j] = cost
+
+    # Treat very large numbers as infinity for disconnected nodes
+    dist[dist >= 999999] = INF
+    return nodes, idx, dist
+
+
+@njit(cache=True)
+def _greedy_core(dist: np.ndarray, start: int) -> np.ndarray:
+    """Nearest-neighbour tour over a dense matrix, returned as node indices."""
+    n = dist.shape[0]
+    visited = np.zeros(n, np.bool_)
+    route = np.empty(n + 1, np.int64)
+    visited[start] = True
+    route[0] = start
+    current = start
+
+    for step in range(1, n):
+        row = dist[current]
+        best = INF
+        best_j = -1
+        first_unvisited = -1
+        # Single pass: track the cheapest unvisited neighbour as we go
+        for j in range(n):
+            if visited[j]:
+                continue
+            if first_unvisited == -1:
+                first_unvisited = j
+            cost = row[j]
+            if cost < best:
+                best = cost
+                best_j = j
+        # Every remaining node is unreachable, take the first one with inf cost
+        if best_j == -1:
+            best_j = first_unvisited
+        visited[best_j] = True
+        route[step] = best_j
+        current = best_j
+
+    route[n] = start
+    return route
+
+
+def _matrix_to_graph(nodes: List[Any], dist: np.ndarray) -> Dict[Any, Dict[Any, float]]:
+    """Convert a dense distance matrix back into the dict-of-dict graph form."""
+    rows = dist.tolist()
+    return {from_node: dict(zip(nodes, rows[i])) for i, from_node in enumerate(nodes)}
+
+
+def greedy_tsp(graph: Dict[Any, Dict[Any, int]], start: Any, allow_disconnected: bool = True) -> Tuple[List[Any], float]:
     """
     Greedy TSP algorithm that supports disconnected graphs.
     
@@ -11,7 +108,8 @@ def greedy_tsp(graph: Dict[Any, Dict[Any, int]], start: Any, allow_disconnected:
         allow_disconnected: If True, allows infinite costs for disconnected nodes
     
     Returns:
-        Tuple of (route, total_cost)
+        Tuple of (route, total_cost); total_cost is a float, even for
+        integer edge costs
     """
     if not graph:
         return [], 0
@@ -19,254 +117,584 @@ def greedy_tsp(graph: Dict[Any, Dict[Any, int]], start: Any, allow_disconnected:
     if start not in graph:
         raise KeyError(f"Start node {start!r} not in graph")
 
-    nodes = set(graph.keys())
-    route = [start]
-    total_cost = 0
-    current = start
-    unvisited = nodes - {start}
+    nodes, _, dist = _to_matrix(graph)
+    return greedy_tsp_matrix(nodes, dist, start, allow_disconnected)
 
-    if not unvisited:
-        return [start, start], 0             
 
-    while unvisited:
-        neighbors = graph[current]
-        candidates = []
-        
-        # Collect all candidates, including those with infinite cost
-        for v in unvisited:
-            if v in neighbors:
-                cost = neighbors[v]
-                # Treat very large numbers as infinity for disconnected nodes
-                if cost == float('inf') or cost >= 999999:
-                    if allow_disconnected:
-                        candidates.append((v, cost))
-                else:
-                    candidates.append((v, cost))
-            elif allow_disconnected:
-                # If no direct connection and we allow disconnected graphs,
-                # add with infinite cost
-                candidates.append((v, float('inf')))
-        
-        if not candidates:
-            if allow_disconnected:
-                # If no candidates but we allow disconnected, pick any unvisited with inf cost
-                next_node = next(iter(unvisited))
-                edge_cost = float('inf')
-            else:
-                raise ValueError(f"Graph is disconnected from node {current}; cannot complete tour")
-        else:
-            # Find minimum cost candidate
-            next_node, edge_cost = min(candidates, key=lambda x: x[1])
-
-        route.append(next_node)
-        total_cost += edge_cost
-        unvisited.remove(next_node)
-        current = next_node
-
-    # Return to start
-    return_cost = float('inf')
-    if start in graph[current]:
-        return_cost = graph[current][start]
-        # Treat very large numbers as infinity
-        if return_cost >= 999999:
-            return_cost = float('inf')
-    elif allow_disconnected:
-        return_cost = float('inf')
-    else:
-        raise ValueError(f"No edge from {current} back to start {start}; cannot close tour")
-    
-    total_cost += return_cost
-    route.append(start)
+def greedy_tsp_matrix(nodes: List[Any], dist: np.ndarray, start: Any,
+                      allow_disconnected: bool = True) -> Tuple[List[Any], float]:
+    """
+    Greedy TSP on a dense distance matrix, as returned by build_dynamic_graph.
+
+    Args:
+        nodes: Node names, in matrix row order
+        dist: n x n float64 costs, inf for missing edges
+        start: Starting node
+        allow_disconnected: If True, allows infinite costs for disconnected nodes
+
+    Returns:
+        Tuple of (route, total_cost); total_cost is a float, even for
+        integer edge costs
+    """
+    n = len(nodes)
+    if n == 0:
+        return [], 0
+
+    if start not in nodes:
+        raise KeyError(f"Start node {start!r} not in graph")
+
+    if n == 1:
+        return [start, start], 0
+
+    route = _greedy_core(dist, nodes.index(start))
+    legs = dist[route[:-1], route[1:]]
+
+    if not allow_disconnected:
+        broken = np.flatnonzero(legs == INF)
+        if broken.size:
+            current = nodes[route[broken[0]]]
+            if broken[0] == n - 1:
+                raise ValueError(f"No edge from {current} back to start {start}; cannot close tour")
+            raise ValueError(f"Graph is disconnected from node {current}; cannot complete tour")
+
+    return [nodes[i] for i in route], float(legs.sum())
+
+
+@njit(cache=True)
+def _tree_bound(dist: np.ndarray, sym: np.ndarray, visited: int, current: int, start: int) -> float:
+    """
+    Admissible lower bound on the cost still needed to finish a partial tour.
+
+    The rest of the tour leaves current, visits every unvisited node and
+    closes at start, so it costs at least the cheapest edge current -> U, plus
+    a minimum spanning tree over U (Prim on sym), plus the cheapest edge
+    U -> start, where U is the unvisited set.
+    """
+    n = dist.shape[0]
+    remaining = np.empty(n, np.int64)
+    k = 0
+    for i in range(n):
+        if not (visited >> i) & 1:
+            remaining[k] = i
+            k += 1
+
+    if k == 0:
+        return dist[current, start]
+
+    enter = INF
+    leave = INF
+    for t in range(k):
+        u = remaining[t]
+        enter = min(enter, dist[current, u])
+        leave = min(leave, dist[u, start])
+
+    key = np.full(k, INF)
+    in_tree = np.zeros(k, np.bool_)
+    key[0] = 0.0
+    mst = 0.0
+    for _ in range(k):
+        best = INF
+        best_t = -1
+        for t in range(k):
+            if not in_tree[t] and key[t] < best:
+                best = key[t]
+                best_t = t
+        if best_t == -1:
+            # Unvisited nodes are split into unreachable groups
+            return INF
+        in_tree[best_t] = True
+        mst += best
+        u = remaining[best_t]
+        for t in range(k):
+            if not in_tree[t] and sym[u, remaining[t]] < key[t]:
+                key[t] = sym[u, remaining[t]]
+
+    return enter + mst + leave
+
+
+def _mask_to_list(mask: int, n: int) -> List[bool]:
+    """Expand a visited bitmask into the list-of-bools form (bit i -> index i)."""
+    return [bool((mask >> i) & 1) for i in range(n)]
+
+
+def _link_to_path(link: Optional[Tuple]) -> List[Any]:
+    """Unwind a (node, parent_link) chain into a root-first list of nodes."""
+    path = []
+    while link is not None:
+        path.append(link[0])
+        link = link[1]
+    path.reverse()
+    return path
+
+
+# Step kinds stored in the last field of a traced step tuple
+STEP_VISIT = 0
+STEP_SEED = 1
+STEP_SOLUTION = 2
+STEP_PRUNE = 3
+STEP_NO_RETURN = 4
+STEP_DEAD_END = 5
+
+
+def _step_to_dict(step: Tuple) -> Dict:
+    """Turn a (depth, node, cost, path, visited, kind) step tuple into a dict."""
+    depth, node, cost, path, visited, kind = step
+    result = {
+        'depth': depth,
+        'current_node': node,
+        'current_cost': cost,
+        'path': list(path),
+        'visited': visited,
+        'is_backtrack': kind >= STEP_PRUNE
+    }
+    if kind == STEP_SEED:
+        result['is_solution'] = True
+        result['reason'] = f'Initial upper bound from greedy: {cost}'
+    elif kind == STEP_SOLUTION:
+        result['is_solution'] = True
+        result['reason'] = f'New best solution found: {cost}'
+    elif kind == STEP_PRUNE:
+        result['reason'] = 'Pruning: lower bound >= best cost'
+    elif kind == STEP_NO_RETURN:
+        result['reason'] = 'Cannot return to start'
+    elif kind == STEP_DEAD_END:
+        result['reason'] = 'No more valid moves, backtracking'
+    return result
+
+
+@njit(cache=True)
+def _bb_core(dist: np.ndarray, start: int, first: int, ub: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Depth-first branch and bound over a dense matrix, without step tracing.
+
+    Children are tried cheapest edge first and pruned with _tree_bound().
+    If first >= 0, only tours whose first hop is first are searched.
+    ub is a 1-element array holding the upper bound. It is re-read before
+    every prune and lowered when a cheaper tour is found, so parallel
+    searches share it. Returns (best_cost, route) for the best tour this call
+    found; route is empty if none beat ub.
+    """
+    n = dist.shape[0]
+    sym = np.minimum(dist, dist.T)
+    order = np.empty((n, n), np.int64)
+    for i in range(n):
+        order[i] = np.argsort(dist[i], kind='mergesort')
+
+    # Fixed-size stack: path[d] is the node at depth d, cost[d] the cost of
+    # path[:d + 1], and next_try[d] the position in order[path[d]] to resume from
+    path = np.empty(n, np.int64)
+    cost = np.zeros(n)
+    next_try = np.zeros(n, np.int64)
+    best_cost = INF
+    best_path = np.empty(n + 1, np.int64)
+    found = False
+
+    path[0] = start
+    visited = np.int64(1) << start
+    depth = 0
+    while depth >= 0:
+        current = path[depth]
+        k = next_try[depth]
+        descended = False
+        while k < n:
+            nxt = order[current, k]
+            k += 1
+            edge = dist[current, nxt]
+            if edge == INF:
+                break
+            if (visited >> nxt) & 1:
+                continue
+            if depth == 0 and first >= 0 and nxt != first:
+                continue
+            new_cost = cost[depth] + edge
+            new_visited = visited | (np.int64(1) << nxt)
+
+            if depth + 2 == n:
+                # nxt is the last node; close the tour
+                total = new_cost + dist[nxt, start]
+                if total < min(best_cost, ub[0]):
+                    best_cost = total
+                    # Unsynchronised write: a racing worker may overwrite it with a
+                    # slightly higher cost, which only weakens pruning
+                    ub[0] = total
+                    best_path[:depth + 1] = path[:depth + 1]
+                    best_path[depth + 1] = nxt
+                    best_path[n] = start
+                    found = True
+                continue
+
+            if new_cost + _tree_bound(dist, sym, new_visited, nxt, start) >= min(best_cost, ub[0]):
+                continue
+
+            next_try[depth] = k
+            depth += 1
+            path[depth] = nxt
+            cost[depth] = new_cost
+            next_try[depth] = 0
+            visited = new_visited
+            descended = True
+            break
+
+        if not descended:
+            visited &= ~(np.int64(1) << current)
+            depth -= 1
+
+    if not found:
+        return best_cost, np.empty(0, np.int64)
+    return best_cost, best_path
+
+
+@njit(cache=True, parallel=True)
+def _bb_parallel(dist: np.ndarray, start: int, ub: float, firsts: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Run _bb_core on each first-hop subtree in parallel and keep the best."""
+    n = dist.shape[0]
+    k = firsts.shape[0]
+    costs = np.full(k, INF)
+    routes = np.empty((k, n + 1), np.int64)
+    found = np.zeros(k, np.bool_)
+
+    # All subtrees prune against one bound, lowered by whichever finds a tour
+    shared_ub = np.full(1, ub)
+    for t in prange(k):
+        cost, route = _bb_core(dist, start, firsts[t], shared_ub)
+        if route.size:
+            costs[t] = cost
+            routes[t] = route
+            found[t] = True
 
-    return route, total_cost
+    best = -1
+    for t in range(k):
+        if found[t] and (best == -1 or costs[t] < costs[best]):
+            best = t
+    if best == -1:
+        return ub, np.empty(0, np.int64)
+    return costs[best], routes[best].copy()
 
 
-def backtracking_tsp(graph: Dict[Any, Dict[Any, int]], start: Any) -> Tuple[List[Any], int, List[Dict]]:
-    """Solve TSP using backtracking algorithm to find optimal solution."""
+def _prepare_search(graph: Dict[Any, Dict[Any, int]], start: Any) -> Tuple[List[Any], np.ndarray, int, List[Any], float]:
+    """
+    Build the distance matrix and seed the upper bound with the greedy tour.
+
+    Returns:
+        Tuple of (nodes, dist, start_idx, seed_route, seed_cost); seed_cost is
+        INF and seed_route empty if greedy cannot close a tour
+    """
+    n = len(graph)
+    if n > MAX_BITMASK_NODES:
+        raise ValueError(f"Backtracking supports at most {MAX_BITMASK_NODES} nodes, got {n}")
+
+    nodes, node_to_idx, dist = _to_matrix(graph)
+
+    # Seed the upper bound with the greedy tour so pruning starts immediately
+    try:
+        seed_route, seed_cost = greedy_tsp_matrix(nodes, dist, start, allow_disconnected=False)
+    except ValueError:
+        seed_route, seed_cost = [], INF
+
+    return nodes, dist, node_to_idx[start], seed_route, seed_cost
+
+
+def backtracking_tsp(graph: Dict[Any, Dict[Any, int]], start: Any,
+                     parallel: bool = False) -> Tuple[List[Any], float]:
+    """Solve TSP using backtracking algorithm to find optimal solution.
+
+    The search is a depth-first branch and bound in the jitted _bb_core(),
+    seeded with the greedy tour. Use backtracking_tsp_traced() to see the
+    individual steps.
+
+    With parallel=True and more than one Numba thread, the subtrees under
+    each first hop are searched in parallel. This is opt-in because the
+    break-even size has not been benchmarked on a multi-core machine, and
+    the parallel kernel takes several seconds to compile the first time.
+
+    Returns:
+        Tuple of (route, total_cost) with total_cost as a float; ([], 0) if
+        no tour exists
+    """
     if not graph:
-        return [], 0, []
+        return [], 0
 
     if start not in graph:
         raise KeyError(f"Start node {start!r} not in graph")
 
-    nodes = list(graph.keys())
-    n = len(nodes)
+    n = len(graph)
     
     if n == 1:
-        return [start, start], 0, []
+        return [start, start], 0
     
-    # Convert to matrix for easier processing
-    node_to_idx = {node: i for i, node in enumerate(nodes)}
-    idx_to_node = {i: node for i, node in enumerate(nodes)}
-    start_idx = node_to_idx[start]
+    nodes, dist, start_idx, best_route, best_cost = _prepare_search(graph, start)
     
-    # Create distance matrix
-    INF = float('inf')
-    dist = [[INF for _ in range(n)] for _ in range(n)]
+    if parallel and get_num_threads() > 1:
+        # Fan out over first hops, cheapest first
+        firsts = np.array([j for j in np.argsort(dist[start_idx], kind='stable')
+                           if j != start_idx and dist[start_idx, j] < INF], dtype=np.int64)
+        core_cost, core_path = _bb_parallel(dist, start_idx, best_cost, firsts)
+    else:
+        core_cost, core_path = _bb_core(dist, start_idx, -1, np.full(1, best_cost))
     
-    for i, from_node in enumerate(nodes):
-        for j, to_node in enumerate(nodes):
-            if to_node in graph[from_node]:
-                dist[i][j] = graph[from_node][to_node]
+    if core_path.size:
+        best_cost = float(core_cost)
+        best_route = [nodes[i] for i in core_path]
     
-    # Variables for backtracking
-    best_cost = INF
-    best_path = []
-    visited = [False] * n
-    current_path = [start_idx]
-    visited[start_idx] = True
-    steps = []
+    if best_cost == INF:
+        return [], 0
     
-    def backtrack(current_pos: int, current_cost: int, path: List[int], depth: int) -> None:
-        nonlocal best_cost, best_path, steps
+    return best_route, best_cost
+
+
+def backtracking_tsp_traced(graph: Dict[Any, Dict[Any, int]], start: Any) -> Iterator[Tuple]:
+    """
+    Solve TSP like backtracking_tsp, lazily yielding every search step.
+
+    Partial tours are expanded best-first by lower bound in Python, so the
+    first complete tour taken off the queue is optimal. Each step is a
+    (depth, node, cost, path, visited, kind) tuple where kind is one of the
+    STEP_* constants and visited is an int bitmask over the graph's node
+    order (see _mask_to_list()). The last STEP_SEED or STEP_SOLUTION step
+    holds the optimal tour. Use map(_step_to_dict, ...) for the dict form.
+
+    Input errors are raised by the call itself, not on first iteration.
+    """
+    if not graph:
+        return iter(())
+
+    if start not in graph:
+        raise KeyError(f"Start node {start!r} not in graph")
+
+    if len(graph) == 1:
+        return iter(())
+
+    return _traced_search(*_prepare_search(graph, start))
+
+
+def _traced_search(nodes: List[Any], dist: np.ndarray, start_idx: int,
+                   seed_route: List[Any], seed_cost: float) -> Iterator[Tuple]:
+    """Best-first branch and bound behind backtracking_tsp_traced()."""
+    n = len(nodes)
+    start = nodes[start_idx]
+    best_cost = seed_cost
+    if seed_cost < INF:
+        yield (0, start, seed_cost, tuple(seed_route), (1 << n) - 1, STEP_SEED)
+    
+    # Cheapest edge in either direction, for the undirected spanning-tree bound
+    sym = np.minimum(dist, dist.T)
+    
+    # Neighbours of each node by ascending edge cost; missing (inf) edges sort last
+    order = np.argsort(dist, axis=1, kind='stable').tolist()
+    
+    # Best-first search: always expand the open node with the lowest bound.
+    # Entries are (lower_bound, current_cost, -path_len, tiebreak, current_pos, link, visited);
+    # link is a (node, parent_link) chain, so a child shares its parent's path
+    # instead of copying it. The unique tiebreak stops heapq from ever comparing
+    # links, which hold user node names that may not be mutually orderable
+    root_visited = 1 << start_idx
+    root_bound = _tree_bound(dist, sym, root_visited, start_idx, start_idx)
+    tiebreak = itertools.count()
+    heap = [(root_bound, 0.0, -1, next(tiebreak), start_idx, (start, None), root_visited)]
+    
+    while heap:
+        # Every open node is bounded below by the cheapest one; stop once it can't win
+        if heap[0][0] >= best_cost:
+            break
+        _, current_cost, neg_len, _, current_pos, link, visited = heapq.heappop(heap)
+        path_len = -neg_len
+        depth = path_len - 1
         
         # Record step
-        steps.append({
-            'depth': depth,
-            'current_node': idx_to_node[current_pos],
-            'current_cost': current_cost,
-            'path': [idx_to_node[i] for i in path],
-            'visited': visited.copy(),
-            'is_backtrack': False
-        })
+        path = tuple(_link_to_path(link))
+        yield (depth, nodes[current_pos], current_cost, path, visited, STEP_VISIT)
         
-        # Pruning: if current cost already exceeds best cost, backtrack
-        if current_cost >= best_cost:
-            steps.append({
-                'depth': depth,
-                'current_node': idx_to_node[current_pos],
-                'current_cost': current_cost,
-                'path': [idx_to_node[i] for i in path],
-                'visited': visited.copy(),
-                'is_backtrack': True,
-                'reason': f'Pruning: cost {current_cost} >= best {best_cost}'
-            })
-            return
+        # All nodes visited; the bound already priced the edge back to start
+        if path_len == n:
+            best_cost = current_cost + float(dist[current_pos, start_idx])
+            yield (depth, start, best_cost, path + (start,), visited, STEP_SOLUTION)
+            continue
         
-        # If all nodes visited, try to return to start
-        if len(path) == n:
-            return_cost = dist[current_pos][start_idx]
-            if return_cost != INF:
-                total_cost = current_cost + return_cost
-                if total_cost < best_cost:
-                    best_cost = total_cost
-                    best_path = path + [start_idx]
-                    steps.append({
-                        'depth': depth,
-                        'current_node': idx_to_node[start_idx],
-                        'current_cost': total_cost,
-                        'path': [idx_to_node[i] for i in best_path],
-                        'visited': visited.copy(),
-                        'is_backtrack': False,
-                        'is_solution': True,
-                        'reason': f'New best solution found: {total_cost}'
-                    })
+        # Try visiting each unvisited node, cheapest edge first
+        has_move = False
+        for next_idx in order[current_pos]:
+            edge_cost = float(dist[current_pos, next_idx])
+            if edge_cost == INF:
+                break
+            if (visited >> next_idx) & 1:
+                continue
+            has_move = True
+            new_cost = current_cost + edge_cost
+            new_visited = visited | (1 << next_idx)
+            new_bound = new_cost + _tree_bound(dist, sym, new_visited, next_idx, start_idx)
+            next_node = nodes[next_idx]
+            
+            if new_bound < best_cost:
+                heapq.heappush(heap, (new_bound, new_cost, neg_len - 1, next(tiebreak),
+                                      next_idx, (next_node, link), new_visited))
             else:
-                steps.append({
-                    'depth': depth,
-                    'current_node': idx_to_node[current_pos],
-                    'current_cost': current_cost,
-                    'path': [idx_to_node[i] for i in path],
-                    'visited': visited.copy(),
-                    'is_backtrack': True,
-                    'reason': 'Cannot return to start'
-                })
-            return
-        
-        # Try visiting each unvisited node
-        for next_idx in range(n):
-            if not visited[next_idx] and dist[current_pos][next_idx] != INF:
-                # Visit next node
-                visited[next_idx] = True
-                new_path = path + [next_idx]
-                new_cost = current_cost + dist[current_pos][next_idx]
-                
-                backtrack(next_idx, new_cost, new_path, depth + 1)
-                
-                # Backtrack
-                visited[next_idx] = False
+                # Pruning: if even the lower bound cannot beat the best cost, backtrack
+                if path_len + 1 == n and dist[next_idx, start_idx] == INF:
+                    kind = STEP_NO_RETURN
+                else:
+                    kind = STEP_PRUNE
+                yield (depth + 1, next_node, new_cost, path + (next_node,), new_visited, kind)
         
         # If no valid moves, record backtrack
-        if depth > 0:  # Don't record for initial call
-            steps.append({
-                'depth': depth,
-                'current_node': idx_to_node[current_pos],
-                'current_cost': current_cost,
-                'path': [idx_to_node[i] for i in path],
-                'visited': visited.copy(),
-                'is_backtrack': True,
-                'reason': 'No more valid moves, backtracking'
-            })
-    
-    # Start backtracking
-    backtrack(start_idx, 0, [start_idx], 0)
-    
+        if not has_move and depth > 0:
+            yield (depth, nodes[current_pos], current_cost, path, visited, STEP_DEAD_END)
+
+
+@njit(cache=True)
+def _held_karp_core(dist: np.ndarray, start: int) -> Tuple[float, np.ndarray]:
+    """Bitmask DP over subsets; dp[mask, last] is the cheapest path from start
+    through the nodes in mask that ends at last."""
+    n = dist.shape[0]
+    full = (1 << n) - 1
+    dp = np.full((1 << n, n), INF)
+    parent = np.full((1 << n, n), -1, dtype=np.int32)
+    dp[1 << start, start] = 0.0
+
+    for mask in range(1 << n):
+        if not (mask >> start) & 1:
+            continue
+        for last in range(n):
+            if not (mask >> last) & 1:
+                continue
+            cost = dp[mask, last]
+            if cost == INF:
+                continue
+            for nxt in range(n):
+                if (mask >> nxt) & 1:
+                    continue
+                new = cost + dist[last, nxt]
+                new_mask = mask | (1 << nxt)
+                if new < dp[new_mask, nxt]:
+                    dp[new_mask, nxt] = new
+                    parent[new_mask, nxt] = last
+
+    best_cost = INF
+    best_last = -1
+    for last in range(n):
+        if last == start:
+            continue
+        total = dp[full, last] + dist[last, start]
+        if total < best_cost:
+            best_cost = total
+            best_last = last
+
+    route = np.empty(n + 1, np.int64)
+    if best_last == -1:
+        return best_cost, np.empty(0, np.int64)
+
+    # Walk parents back from the last node to rebuild the tour
+    route[0] = start
+    route[n] = start
+    mask = full
+    last = best_last
+    for pos in range(n - 1, 0, -1):
+        route[pos] = last
+        prev = parent[mask, last]
+        mask ^= 1 << last
+        last = prev
+    return best_cost, route
+
+
+def held_karp_tsp(graph: Dict[Any, Dict[Any, int]], start: Any) -> Tuple[List[Any], float]:
+    """
+    Solve TSP exactly with the Held-Karp dynamic programme in O(n^2 * 2^n).
+
+    Much faster than backtracking_tsp when no step trace is needed, but the
+    DP table needs 2^n * n entries, so it is limited to 20 nodes.
+
+    Args:
+        graph: Dictionary representing the graph with costs
+        start: Starting node
+
+    Returns:
+        Tuple of (route, total_cost) with total_cost as a float; ([], 0) if
+        no tour exists
+    """
+    if not graph:
+        return [], 0
+
+    if start not in graph:
+        raise KeyError(f"Start node {start!r} not in graph")
+
+    nodes, idx, dist = _to_matrix(graph)
+    n = len(nodes)
+
+    if n == 1:
+        return [start, start], 0
+    if n > HELD_KARP_MAX_NODES:
+        raise ValueError(f"Held-Karp supports at most {HELD_KARP_MAX_NODES} nodes, got {n}")
+
+    best_cost, route = _held_karp_core(dist, idx[start])
     if best_cost == INF:
-        return [], 0, steps
-    
-    # Convert result back to node names
-    result_path = [idx_to_node[i] for i in best_path]
-    
-    return result_path, best_cost, steps
+        return [], 0
 
+    return [nodes[i] for i in route], float(best_cost)
 
-def build_dynamic_graph() -> Dict[str, Dict[str, int]]:
-    """Build graph dynamically with edge costs entered manually."""
+
+def build_dynamic_graph() -> Tuple[List[str], np.ndarray]:
+    """Build graph dynamically with edge costs entered one row at a time.
+
+    Returns:
+        Tuple of (nodes, dist) where dist is an n x n float64 matrix with
+        inf for missing edges; use _matrix_to_graph() for the dict form.
+    """
     n = int(input("Masukkan jumlah node: "))
     nodes = []
     for i in range(n):
         name = input(f"Nama node {i+1}: ")
         nodes.append(name)
 
-    graph: Dict[str, Dict[str, int]] = {node: {} for node in nodes}
+    dist = np.full((n, n), INF)
 
-    print("\nMasukkan cost antar node:")
-    print("- Gunakan 0 untuk node ke dirinya sendiri")
+    print("\nMasukkan cost antar node, satu baris per node dipisah koma:")
+    print(f"- Urutan kolom: {', '.join(nodes)}")
+    print("- Cost node ke dirinya sendiri selalu 0")
     print("- Gunakan 'inf' atau angka sangat besar (999999) untuk node yang tidak terhubung")
     
     for i in range(n):
-        for j in range(n):
-            if i == j:
-                graph[nodes[i]][nodes[j]] = 0
-                print(f"Cost {nodes[i]} -> {nodes[j]}: 0 (diagonal)")
-            else:
-                cost_input = input(f"Cost {nodes[i]} -> {nodes[j]} (atau 'inf' untuk tidak terhubung): ")
-                
-                if cost_input.lower() in ['inf', 'infinity', '∞']:
-                    cost = float('inf')
-                elif cost_input.isdigit():
-                    cost = int(cost_input)
-                else:
-                    try:
-                        cost = float(cost_input)
-                        if cost >= 999999:
-                            cost = float('inf')
-                    except ValueError:
-                        print("Input tidak valid, menggunakan infinity")
-                        cost = float('inf')
-                
-                graph[nodes[i]][nodes[j]] = cost
+        while True:
+            line = input(f"Cost {nodes[i]} -> *: ")
+            tokens = [t.strip().lower() for t in line.split(',')]
+            if len(tokens) != n:
+                print(f"Harus ada {n} nilai, coba lagi")
+                continue
+            try:
+                row = np.array(['inf' if t in _INF_TOKENS else t for t in tokens], dtype=np.float64)
+            except ValueError:
+                print("Input tidak valid, coba lagi")
+                continue
+            break
+
+        row[row >= 999999] = INF
+        row[i] = 0
+        dist[i] = row
 
-    return graph
+    return nodes, dist
 
 
 def format_cost(cost: float) -> str:
-    """Format cost for display, handling infinity values."""
-    if cost == float('inf'):
-        return "∞ (Infinite)"
+    """Format cost for display, handling infinity values.
+
+    Whole-number costs print without a trailing ".0", as integer input did
+    before costs were stored as float64.
+    """
+    if math.isinf(cost):
+        return _INF_STR
+    if isinstance(cost, float) and cost.is_integer():
+        return str(int(cost))
     return str(cost)
 
 def main() -> None:
-    graph = build_dynamic_graph()
+    nodes, dist = build_dynamic_graph()
     start = input("Masukkan node awal: ")
     
     print(f"\n=== Menjalankan TSP dengan support untuk graph non-connected ===")
-    route, cost = greedy_tsp(graph, start, allow_disconnected=True)
+    route, cost = greedy_tsp_matrix(nodes, dist, start, allow_disconnected=True)
     
     print(f"\nGreedy TSP route starting at {start}: {' -> '.join(route)}")
     print(f"Total cost: {format_cost(cost)}")
     
-    if cost == float('inf'):
+    if cost == INF:
         print("\n⚠️  PERINGATAN: Graph tidak sepenuhnya terhubung!")
         print("   Beberapa node memerlukan jalur tidak langsung dengan cost infinite.")
         print("   Dalam implementasi nyata, Anda mungkin perlu algoritma pathfinding tambahan.")